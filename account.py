@@ -2,30 +2,116 @@
 Bank Account class
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 from collections import namedtuple  # noqa
+from array import array
 
-import pytz
-import itertools
+import math
 import numbers
+import time
 
 from time_zone import TimeZone
 from transactions import Transaction
 
-transactions = dict()
+_UTC = timezone.utc
+
+# Transactions log stored column-wise, the row of transaction N is N - 1.
+_log_codes = bytearray()
+_log_accounts = []
+_log_timestamps = array('q')
+
+_last_sec = -1
+_last_stamp = ''
+
+
+def _utc_stamp(timestamp: int) -> str:
+    """Return the UTC time of the timestamp as YYYYMMDDHHMMSS string."""
+
+    global _last_sec, _last_stamp
+
+    if timestamp != _last_sec:
+        t = time.gmtime(timestamp)
+        _last_stamp = (f'{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}'
+                       f'{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}')
+        _last_sec = timestamp
+
+    return _last_stamp
+
+
+def _make_validator(min_value: numbers.Real):
+    """Return amount validator specialized for the minimum value."""
+
+    def validate(value: numbers.Real) -> int:
+        t = type(value)
+        if (t is int or t is float) and min_value <= value < math.inf:
+            return round(value * 100)
+        return Account.validate_real_number(value, min_value)
+
+    return validate
+
+
+_validate_amount = _make_validator(0.01)
+
+
+def _log_transaction(id_num: int,
+                     code: str,
+                     acc_num: str,
+                     timestamp: int) -> None:
+    """Record the transaction in the transactions log."""
+
+    if id_num < 1:
+        raise ValueError('Transaction id must be a positive number.')
+
+    index = id_num - 1
+    missing = index + 1 - len(_log_accounts)
+    if missing > 0:
+        _log_codes.extend(bytes(missing))
+        _log_accounts.extend([None] * missing)
+        _log_timestamps.extend(array('q', bytes(8 * missing)))
+
+    _log_codes[index] = ord(code)
+    _log_accounts[index] = acc_num
+    _log_timestamps[index] = timestamp
+
+
+def _apply_batch(amounts: list, balance: int) -> tuple:
+    """Apply signed amounts in cents to the balance, rejecting overdrafts."""
+
+    flags = []
+    for amount in amounts:
+        accepted = balance + amount >= 0
+        if accepted:
+            balance += amount
+        flags.append(accepted)
+
+    return balance, flags
+
+
+def _apply_interest(balances: list, rate: numbers.Real) -> list:
+    """Return the balances in cents with interest at the given rate applied."""
+
+    return [balance + round(balance * rate) for balance in balances]
 
 
 class Account:
     """Account object"""
 
-    transaction_counter = itertools.count(1)
-    _tz = TimeZone('UTC')
+    __slots__ = ('_account_number', '_acc_prefix', '_code_prefix_len',
+                 '_first_name', '_last_name', '_full_name', '_balance_cents',
+                 '_tz')
+
+    _next_id = 0
+    _default_tz = TimeZone('UTC')
     _interest_rate = 0.005
+    _CODE_D = 'D'
+    _CODE_W = 'W'
+    _CODE_I = 'I'
+    _CODE_X = 'X'
     _transaction_codes = {
-        'deposit': 'D',
-        'withdraw': 'W',
-        'interest': 'I',
-        'rejected': 'X'
+        'deposit': _CODE_D,
+        'withdraw': _CODE_W,
+        'interest': _CODE_I,
+        'rejected': _CODE_X
     }
 
     def __init__(self,
@@ -37,14 +123,17 @@ class Account:
 
         if zone is not None:
             self.tz = TimeZone(zone=zone)
+        else:
+            self._tz = Account._default_tz
         self._account_number = number
-        self._first_name = None
-        self._last_name = None
+        self._acc_prefix = '-' + number + '-'
+        # Confirmation layout is C-<number>-YYYYMMDDHHMMSS-<id>.
+        self._code_prefix_len = 2 + len(number) + 1 + 14 + 1
         self.first_name = first_name
         self.last_name = last_name
-        self._full_name = None
-        self._balance = Account.validate_initial_balance(initial_balance,
-                                                         min_value=0)
+        initial_balance = Account.validate_initial_balance(initial_balance,
+                                                           min_value=0)
+        self._balance_cents = round(initial_balance * 100)
 
     @property
     def account_number(self):
@@ -86,7 +175,7 @@ class Account:
 
     @property
     def balance(self):
-        return self._balance
+        return self._balance_cents / 100
 
     @classmethod
     def get_interest_rate(cls):
@@ -94,79 +183,152 @@ class Account:
 
     @classmethod
     def set_interest_rate(cls, value):
-        if not isinstance(value, numbers.Real):
+        t = type(value)
+        if (t is not int and t is not float
+                and not isinstance(value, numbers.Real)):
             raise ValueError('Interest rate must be a real number.')
+        if (not isinstance(value, numbers.Integral)
+                and not math.isfinite(value)):
+            raise ValueError('Interest rate must be a finite number.')
         if value < 0:
             raise ValueError('Interest rate cannot be negative.')
         cls._interest_rate = value
 
-    def generate_conf_number(self, code: str, id_num: int, dt: datetime) -> str:
+    def generate_conf_number(self,
+                             code: str,
+                             id_num: int,
+                             timestamp: int) -> str:
         """Generate confirmation number for every transaction."""
 
-        dt_stamp = dt.strftime('%Y%m%d%H%M%S')
-        transactions[id_num] = {
-            'id_num': id_num,
-            'code': code,
-            'acc_num': self.account_number,
-            'dt': dt
-        }
+        dt_stamp = _utc_stamp(timestamp)
+        _log_transaction(id_num, code, self.account_number, timestamp)
 
-        return f'{code}-{self.account_number}-{dt_stamp}-{id_num}'
+        return ''.join((code, self._acc_prefix, dt_stamp, '-', str(id_num)))
 
     def deposit(self, amount: float) -> str:
         """Deposit amount on the balance."""
 
-        amount = Account.validate_real_number(amount, min_value=0.01)
+        amount = _validate_amount(amount)
 
-        dt = datetime.now(tz=pytz.utc)
-        id_num = next(Account.transaction_counter)
-        code = Account._transaction_codes['deposit']
-        confirmation = self.generate_conf_number(code, id_num, dt)
+        timestamp = int(time.time())
+        Account._next_id += 1
+        id_num = Account._next_id
+        code = Account._CODE_D
+        confirmation = self.generate_conf_number(code, id_num, timestamp)
 
-        self._balance += amount
+        self._balance_cents += amount
 
         return confirmation
 
     def withdraw(self, amount: numbers.Real) -> str:
         """Withdraw amount from the balance."""
 
-        amount = Account.validate_real_number(amount, min_value=0.01)
+        amount = _validate_amount(amount)
 
-        id_num = next(Account.transaction_counter)
-        dt = datetime.now(tz=pytz.utc)
+        Account._next_id += 1
+        id_num = Account._next_id
+        timestamp = int(time.time())
 
-        if self._balance - amount < 0:
-            code = Account._transaction_codes['rejected']
-            return self.generate_conf_number(code, id_num, dt)
+        if self._balance_cents - amount < 0:
+            code = Account._CODE_X
+            return self.generate_conf_number(code, id_num, timestamp)
 
-        code = Account._transaction_codes['withdraw']
-        confirmation = self.generate_conf_number(code, id_num, dt)
+        code = Account._CODE_W
+        confirmation = self.generate_conf_number(code, id_num, timestamp)
 
-        self._balance -= amount
+        self._balance_cents -= amount
 
         return confirmation
 
     def pay_interest(self):
         """Deposit interest on the balance."""
 
-        interest = self._balance * Account._interest_rate
+        interest = round(self._balance_cents * Account._interest_rate)
 
-        dt = datetime.now(tz=pytz.utc)
-        id_num = next(Account.transaction_counter)
-        code = Account._transaction_codes['interest']
+        timestamp = int(time.time())
+        Account._next_id += 1
+        id_num = Account._next_id
+        code = Account._CODE_I
 
-        confirmation = self.generate_conf_number(code, id_num, dt)
-        self._balance += interest
+        confirmation = self.generate_conf_number(code, id_num, timestamp)
+        self._balance_cents += interest
 
         return confirmation
 
-    @staticmethod
-    def get_transaction(confirmation: str, tz: str) -> Transaction:
-        """Return transaction by confirmation number."""
+    @classmethod
+    def pay_interest_batch(cls, accounts: list) -> list:
+        """Deposit interest on the balances of all the given accounts."""
+
+        accounts = list(accounts)
+        if len({id(acc) for acc in accounts}) != len(accounts):
+            raise ValueError('Every account can appear in a batch only once.')
+
+        balances = _apply_interest([acc._balance_cents for acc in accounts],
+                                   Account._interest_rate)
+
+        timestamp = int(time.time())
+        confirmations = []
+        for account, balance in zip(accounts, balances):
+            account._balance_cents = balance
+            Account._next_id += 1
+            confirmations.append(
+                account.generate_conf_number(Account._CODE_I, Account._next_id,
+                                             timestamp)
+            )
 
-        id_num = int(confirmation.split('-')[-1])
+        return confirmations
+
+    def apply_batch(self, amounts: list) -> list:
+        """Apply signed amounts to the balance, rejecting overdrafts."""
+
+        cents = []
+        for amount in amounts:
+            # Negative amounts are withdrawals, positive ones are deposits.
+            if isinstance(amount, numbers.Real) and amount < 0:
+                cents.append(-_validate_amount(-amount))
+            else:
+                cents.append(_validate_amount(amount))
+
+        self._balance_cents, flags = _apply_batch(cents, self._balance_cents)
+
+        timestamp = int(time.time())
+        confirmations = []
+        for amount, accepted in zip(cents, flags):
+            if not accepted:
+                code = Account._CODE_X
+            elif amount > 0:
+                code = Account._CODE_D
+            else:
+                code = Account._CODE_W
+            Account._next_id += 1
+            confirmations.append(
+                self.generate_conf_number(code, Account._next_id, timestamp)
+            )
+
+        return confirmations
+
+    def get_transaction(self, confirmation: str, tz: str) -> Transaction:
+        """Return transaction of the account by confirmation number."""
+
+        if not confirmation.startswith(self._acc_prefix, 1):
+            raise ValueError('Confirmation number of another account.')
+
+        id_num = int(confirmation[self._code_prefix_len:])
 
-        return Transaction(**transactions[id_num], tz=tz)
+        index = id_num - 1
+        if (index < 0 or index >= len(_log_accounts)
+                or _log_accounts[index] is None):
+            raise ValueError('No such a transaction.')
+        if _log_accounts[index] != self._account_number:
+            raise ValueError('Confirmation number of another account.')
+
+        timestamp = _log_timestamps[index]
+
+        return Transaction(code=chr(_log_codes[index]),
+                           acc_num=_log_accounts[index],
+                           dt=datetime.fromtimestamp(timestamp, _UTC),
+                           id_num=id_num,
+                           tz=tz)
 
     @staticmethod
     def validate_name(value: str, field_name: str) -> str:
@@ -188,9 +350,19 @@ class Account:
                                  min_value: numbers.Real) -> numbers.Real:
         """Validate the initial balance of the account holder."""
 
-        if not isinstance(value, numbers.Real):
+        t = type(value)
+        if (t is not int and t is not float
+                and not isinstance(value, numbers.Real)):
             raise ValueError('The value must be a real number.')
 
+        if not isinstance(value, numbers.Integral):
+            try:
+                finite = math.isfinite(value)
+            except OverflowError as ex:
+                raise ValueError('The value is too large.') from ex
+            if not finite:
+                raise ValueError('The value must be a finite number.')
+
         if min_value is not None and value < min_value:
             raise ValueError(f'The value must be at least {min_value}.')
 
@@ -201,15 +373,15 @@ class Account:
 
     @staticmethod
     def validate_real_number(value: numbers.Real,
-                             min_value: numbers.Real = 0):
-        """Validate the amount passed to a payment method."""
+                             min_value: numbers.Real = 0) -> int:
+        """Validate the amount passed to a payment method, return cents."""
 
         value = Account.validate_initial_balance(value, min_value)
 
         if value == 0:
             raise ValueError('The value can not be 0.')
 
-        return value
+        return round(value * 100)
 
     # @staticmethod
     # def parse_confirmation_code(confirmation_code: str, tz=None):
@@ -6,8 +6,11 @@ from unittest import TestCase
 from unittest.mock import patch
 
 from datetime import datetime
+from fractions import Fraction
 import pytz
+import time
 
+import account
 from account import Account
 from time_zone import TimeZone
 
@@ -46,6 +49,17 @@ class TestAccount(TestCase):
         self.assertEqual(self.account.balance, 0)
         self.assertEqual(self.account.get_interest_rate(), 0.005)
 
+    def test_full_name_updated_on_name_change(self):
+        """Test full name reflects changes of first name and last name."""
+
+        self.assertEqual(self.account.full_name, 'Name Surname')
+
+        self.account.first_name = 'John'
+        self.assertEqual(self.account.full_name, 'John Surname')
+
+        self.account.last_name = 'Dow'
+        self.assertEqual(self.account.full_name, 'John Dow')
+
     def test_invalid_names_error(self):
         """Test invalid first name and last name raises ValueError."""
 
@@ -72,27 +86,64 @@ class TestAccount(TestCase):
 
         self.assertEqual(account.tz, expected_tz)
 
+    def test_non_finite_amount_error(self):
+        """Test infinite and NaN amounts raise ValueError."""
+
+        for value in (float('inf'), float('nan'), Fraction(10 ** 400)):
+            with self.assertRaises(ValueError):
+                create_account(initial_balance=value)
+            with self.assertRaises(ValueError):
+                self.account.deposit(value)
+            with self.assertRaises(ValueError):
+                self.account.withdraw(value)
+
+        self.assertEqual(self.account.balance, 0)
+
+    def test_set_non_finite_interest_rate_error(self):
+        """Test infinite and NaN interest rates raise ValueError."""
+
+        rate = Account.get_interest_rate()
+
+        for value in (float('inf'), float('nan')):
+            with self.assertRaises(ValueError):
+                Account.set_interest_rate(value)
+
+        self.assertEqual(Account.get_interest_rate(), rate)
+
     def test_generate_confirmation_number(self):
         """Test generating confirmation number of transaction."""
 
-        dt = datetime.now()
+        timestamp = int(time.time())
         payload = {
             'code': self.account._transaction_codes['deposit'],
             'id_num': 5,
-            'dt': dt
+            'timestamp': timestamp
         }
 
         confirmation = self.account.generate_conf_number(**payload)
+        dt = datetime.fromtimestamp(timestamp, pytz.utc)
         expected = (f'D-{self.account.account_number}-'
                     f'{dt.strftime('%Y%m%d%H%M%S')}-5')
 
         self.assertEqual(confirmation, expected)
 
-    @patch('account.next')
-    def test_deposit_on_account(self, mocked_transaction_counter):
+    def test_generate_confirmation_number_invalid_id_error(self):
+        """Test non-positive transaction ids raise ValueError."""
+
+        confirmation = self.account.deposit(100)
+        other = create_account(number='654321')
+
+        for id_num in (0, -1):
+            with self.assertRaises(ValueError):
+                other.generate_conf_number('D', id_num, int(time.time()))
+
+        tsn = self.account.get_transaction(confirmation, 'UTC')
+        self.assertEqual(tsn.account_number, self.account.account_number)
+
+    @patch('account.Account._next_id', 4)
+    def test_deposit_on_account(self):
         """Test deposit amount on the account's balance."""
 
-        mocked_transaction_counter.return_value = 5
         current_balance = self.account.balance
         amount = 10.5
 
@@ -134,6 +185,80 @@ class TestAccount(TestCase):
         self.assertEqual(self.account.balance, expected)
         self.assertTrue(confirmation.startswith('I'))
 
+    def test_pay_interest_batch(self):
+        """Test pay interest to the balances of several accounts."""
+
+        accounts = [create_account(number=str(i), initial_balance=i * 100)
+                    for i in range(3)]
+        rate = Account.get_interest_rate()
+
+        confirmations = Account.pay_interest_batch(accounts)
+
+        for i, account in enumerate(accounts):
+            self.assertEqual(account.balance,
+                             round(i * 100 * (1 + rate), 2))
+        self.assertEqual(len(confirmations), 3)
+        self.assertTrue(all(c.startswith('I') for c in confirmations))
+
+    def test_pay_interest_batch_from_generator(self):
+        """Test pay interest to accounts given by a generator."""
+
+        accounts = [create_account(initial_balance=100) for _ in range(2)]
+
+        confirmations = Account.pay_interest_batch(acc for acc in accounts)
+
+        self.assertEqual(len(confirmations), 2)
+        for account in accounts:
+            self.assertEqual(account.balance, 100.5)
+
+    def test_pay_interest_batch_duplicate_account_error(self):
+        """Test the same account twice in a batch raises ValueError."""
+
+        account = create_account(initial_balance=101)
+
+        with self.assertRaises(ValueError):
+            Account.pay_interest_batch([account, account])
+
+        self.assertEqual(account.balance, 101)
+
+    def test_pay_interest_batch_on_subclass(self):
+        """Test batch interest on a subclass shares the transaction ids."""
+
+        class SubAccount(Account):
+            __slots__ = ()
+
+        sub_account = SubAccount('654321', 'Name', 'Surname',
+                                 initial_balance=100)
+
+        sub_confirmation = SubAccount.pay_interest_batch([sub_account])[0]
+        confirmation = self.account.deposit(1)
+
+        self.assertNotEqual(sub_confirmation.rpartition('-')[2],
+                            confirmation.rpartition('-')[2])
+        tsn = sub_account.get_transaction(sub_confirmation, 'UTC')
+        self.assertEqual(tsn.account_number, '654321')
+
+    def test_apply_batch_to_account(self):
+        """Test applying a batch of deposits and withdrawals."""
+
+        confirmations = self.account.apply_batch([100, -30, -200, 20.5])
+
+        self.assertEqual(self.account.balance, 90.5)
+        self.assertEqual([c[0] for c in confirmations], ['D', 'W', 'X', 'D'])
+
+    def test_apply_batch_invalid_amount_error(self):
+        """Test invalid amount in a batch raises ValueError."""
+
+        test_cases = [[100, 0], [100, 'abc'], [100, -0.001],
+                      [100, float('inf')], [100, float('-inf')],
+                      [100, float('nan')]]
+
+        for amounts in test_cases:
+            with self.assertRaises(ValueError):
+                self.account.apply_batch(amounts)
+
+        self.assertEqual(self.account.balance, 0)
+
     def test_get_transaction_method(self):
         """Test the get_transaction method returns a valid transaction."""
 
@@ -160,3 +285,38 @@ class TestAccount(TestCase):
         self.assertEqual(tsn.transaction_id, id_num)
         self.assertEqual(tsn.time, expected_time)
         self.assertEqual(tsn.time_utc, expected_time_utc)
+
+    def test_get_transaction_unknown_id_error(self):
+        """Test get_transaction with ids of no recorded transaction."""
+
+        confirmation = self.account.deposit(100)
+        prefix = confirmation[:confirmation.rfind('-') + 1]
+
+        unfilled_id = len(account._log_accounts) + 1
+        self.account.generate_conf_number('D', unfilled_id + 1,
+                                          int(time.time()))
+
+        for id_num in (0, -1, unfilled_id, unfilled_id + 100):
+            with self.assertRaises(ValueError):
+                self.account.get_transaction(f'{prefix}{id_num}',
+                                             self.account.tz.name)
+
+    def test_get_transaction_of_another_account_error(self):
+        """Test get_transaction with another account's confirmation."""
+
+        other = create_account(number='654321')
+        confirmation = other.deposit(100)
+
+        with self.assertRaises(ValueError):
+            self.account.get_transaction(confirmation, self.account.tz.name)
+
+    def test_get_transaction_forged_id_error(self):
+        """Test get_transaction with another account's id on own prefix."""
+
+        own = self.account.deposit(100)
+        other = create_account(number='654321').deposit(100)
+
+        forged = own[:own.rfind('-') + 1] + other.rpartition('-')[2]
+
+        with self.assertRaises(ValueError):
+            self.account.get_transaction(forged, self.account.tz.name)